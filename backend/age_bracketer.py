@@ -1,7 +1,8 @@
 import pandas as pd
+import sys
 
 # 1. read file
-path="./datasets"
+path=sys.argv[1] if len(sys.argv) > 1 else "./datasets"   # the US31 folder
 recom = pd.read_csv(path+"/output/nutrition_recommendations_long.csv")
 recom["age_end"] = recom["age_end"].fillna(200)
 
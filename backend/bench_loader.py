@@ -0,0 +1,623 @@
+"""
+Micro-benchmarks for the staging loader (no database needed unless noted).
+
+Run from the repository root, e.g.:
+    python backend/bench_loader.py convert
+    python backend/bench_loader.py nutrition --config backend/loader.yml
+    python backend/bench_loader.py indexes --config backend/loader.yml
+    python backend/bench_loader.py partitions --config backend/loader.yml --year 2018
+    python backend/bench_loader.py stream --replicate 40 --chunk-rows 20000
+    python backend/bench_loader.py biomarkers --replicate 100
+    python backend/bench_loader.py cube --rows 1000000
+    python backend/bench_loader.py reset --config backend/loader.yml
+"""
+from __future__ import annotations
+import io
+import os
+import sys
+import json
+import re
+import tempfile
+import subprocess
+import time
+import argparse
+import contextlib
+import yaml
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import loader  # noqa: E402
+
+S9_CSV = "backend/data_clean/S9_Risk_factor_unadjusted_clean.csv"
+CUBE09_CSV = "backend/data_clean/nhs_cube09_dietary_clean.csv"
+BIOMARKER_CSVS = ["backend/data_clean/biomarkers_kidney_clean.csv",
+                  "backend/data_clean/biomarkers_liver_clean.csv"]
+
+
+def _best_of(fn, repeat):
+    """Run fn repeat times and return (best seconds, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _legacy_rows(df):
+    """Row conversion as chunked_insert_dataframe did it before the column-wise converter."""
+    df = df.where(pd.notna(df), None).astype(object)
+    return [tuple(loader._to_py(v) for v in row) for row in df.itertuples(index=False, name=None)]
+
+
+def bench_convert(args):
+    """Cells/s of the per-cell _to_py path vs the column-wise dataframe_to_rows."""
+    df = loader.read_staging_csv(args.csv, "stg_s9_risk_unadj")
+    cells = df.shape[0] * df.shape[1]
+    t_old, old_rows = _best_of(lambda: _legacy_rows(df), args.repeat)
+    t_new, new_rows = _best_of(lambda: loader.dataframe_to_rows(df), args.repeat)
+    if old_rows != new_rows:
+        print("WARNING: converted rows differ between the two paths")
+    print(f"{args.csv}: {df.shape[0]} rows x {df.shape[1]} cols = {cells} cells")
+    print(f"  per-cell _to_py     : {t_old:.3f}s ({cells / t_old:,.0f} cells/s)")
+    print(f"  column-wise convert : {t_new:.3f}s ({cells / t_new:,.0f} cells/s)")
+    print(f"  speedup             : {t_old / t_new:.1f}x")
+
+
+def _connect(config):
+    """Open a loader connection using the YAML config (database must exist)."""
+    cfg = yaml.safe_load(open(config, "r", encoding="utf-8"))
+    return cfg, loader.connect_mysql(cfg["mysql"])
+
+
+def _nutrition_snapshot(cur):
+    """All nutrition rows (surrogate ids excluded) in insertion order."""
+    snap = {}
+    for table, _, cols in loader.NUTRITION_FILES:
+        order = "nutrient_id" if table == "NutrientDimension" else "id"
+        cur.execute(f"SELECT {', '.join(cols)} FROM {table} ORDER BY {order}")
+        snap[table] = cur.fetchall()
+    return snap
+
+
+def _delete_nutrition(cur):
+    """The DELETE-based reset run_nutrition_inserts used before reset_tables."""
+    cur.execute("DELETE FROM NutrientRecommendation;")
+    cur.execute("DELETE FROM FoodNutrient;")
+    cur.execute("DELETE FROM NutrientDimension;")
+
+
+def _legacy_nutrition_inserts(cur, data_dir):
+    """The pre-CSV path: one INSERT round trip per nutrition row."""
+    _delete_nutrition(cur)
+    for table, file_name, cols in loader.NUTRITION_FILES:
+        df = pd.read_csv(os.path.join(data_dir, file_name), usecols=cols)[cols]
+        sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join(['%s'] * len(cols))})"
+        for row in loader.dataframe_to_rows(df):
+            cur.execute(sql, row)
+
+
+def bench_nutrition(args):
+    """Time per-row INSERTs vs run_nutrition_inserts and check both give the same rows (rolled back)."""
+    cfg, conn = _connect(args.config)
+    data_dir = cfg.get("nutrition_dir", loader.NUTRITION_DIR)
+    cur = conn.cursor()
+    try:
+        loader.ensure_core_schema(cur)
+        t0 = time.perf_counter()
+        _legacy_nutrition_inserts(cur, data_dir)
+        t_old = time.perf_counter() - t0
+        old = _nutrition_snapshot(cur)
+        t0 = time.perf_counter()
+        _delete_nutrition(cur)  # run_nutrition_inserts would TRUNCATE, which commits
+        loader.load_nutrition_tables(cur, data_dir)
+        t_new = time.perf_counter() - t0
+        new = _nutrition_snapshot(cur)
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+    for table in old:
+        status = "identical" if old[table] == new[table] else "DIFFERENT"
+        print(f"  {table}: {len(new[table])} rows, {status}")
+    print(f"  per-row INSERTs      : {t_old:.2f}s")
+    print(f"  batched CSV inserts  : {t_new:.2f}s")
+    print(f"  speedup              : {t_old / t_new:.1f}x")
+
+
+def bench_reset(args):
+    """
+    DELETE vs TRUNCATE reset of FoodNutrient alone and of the whole nutrition
+    group, each on freshly loaded tables, plus the parent-first reload (needs
+    MySQL; commits, and leaves the nutrition tables loaded).
+    """
+    cfg, conn = _connect(args.config)
+    data_dir = cfg.get("nutrition_dir", loader.NUTRITION_DIR)
+    group = loader.RELOAD_GROUPS["nutrition"]
+    cur = conn.cursor()
+
+    def reload():
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader.run_nutrition_inserts(cur, data_dir)
+        conn.commit()
+
+    def timed(fn):
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        conn.commit()
+        return time.perf_counter() - t0
+
+    results = {}
+    try:
+        loader.ensure_core_schema(cur)
+        for mode in ("delete", "truncate"):
+            reload()
+            cur.execute("SELECT COUNT(*) FROM FoodNutrient")
+            (rows,) = cur.fetchone()
+            if mode == "delete":
+                t_single = timed(lambda: cur.execute("DELETE FROM FoodNutrient"))
+                reload()
+                t_group = timed(lambda: _delete_nutrition(cur))
+            else:
+                t_single = timed(lambda: cur.execute("TRUNCATE TABLE FoodNutrient"))
+                reload()
+                t_group = timed(lambda: loader.reset_tables(cur, group))
+            t_reload = timed(lambda: loader.load_nutrition_tables(cur, data_dir, order=loader.fk_order(cur, group)))
+            results[mode] = (rows, t_single, t_group, t_reload)
+    finally:
+        cur.close()
+        conn.close()
+    print(f"FoodNutrient: {results['delete'][0]} rows")
+    for mode, (_, t_single, t_group, t_reload) in results.items():
+        print(f"  {mode:<8}: FoodNutrient {t_single:.3f}s, nutrition group {t_group:.3f}s, reload {t_reload:.2f}s")
+    print(f"  FoodNutrient reset speedup: {results['delete'][1] / results['truncate'][1]:.1f}x")
+
+
+def _timed_transform(conn, cur, repeat):
+    """Best-of-repeat run_transform_sql per step (each run rolled back)."""
+    best = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = loader.run_transform_sql(cur)
+        conn.rollback()
+        steps = {name: end - start for name, (start, end) in timings.items()}
+        steps["total"] = max(end for _, end in timings.values())
+        best = steps if best is None else {k: min(v, best[k]) for k, v in steps.items()}
+    return best
+
+
+def bench_indexes(args):
+    """Transform time with and without the staging indexes (needs loaded staging tables)."""
+    _, conn = _connect(args.config)
+    cur = conn.cursor()
+    try:
+        loader.ensure_s8_cause_name(cur)
+        tables = loader.analyze_staging_tables(cur)
+        cur.execute("SELECT COUNT(*) FROM stg_s9_risk_unadj")
+        print(f"stg_s9_risk_unadj: {cur.fetchone()[0]} rows")
+        for table in tables:
+            loader.drop_staging_indexes(cur, table)
+        cur.execute(f"ANALYZE TABLE {', '.join(tables)}")
+        cur.fetchall()
+        without = _timed_transform(conn, cur, args.repeat)
+        t0 = time.perf_counter()
+        loader.analyze_staging_tables(cur, tables)
+        build = time.perf_counter() - t0
+        with_ix = _timed_transform(conn, cur, args.repeat)
+    finally:
+        conn.rollback()
+        cur.close()
+        conn.close()
+    print(f"{'step':<28}{'no index s':>12}{'indexed s':>12}{'speedup':>9}")
+    for name in without:
+        ratio = without[name] / with_ix[name] if with_ix[name] else float("inf")
+        print(f"{name:<28}{without[name]:>12.3f}{with_ix[name]:>12.3f}{ratio:>8.1f}x")
+    print(f"index build + ANALYZE: {build:.2f}s")
+
+
+def bench_partitions(args):
+    """
+    Single-year query and single-year reload on the partitioned
+    fact_risk_burden_unadj (needs partition_facts, loaded staging and facts).
+    The reloads rewrite the year from the same staging rows.
+    """
+    table = "fact_risk_burden_unadj"
+    flat = "bench_frbu_unpartitioned"
+    step = next(s for s in loader.TRANSFORM_STEPS if s["name"] == table)
+    _, conn = _connect(args.config)
+    cur = conn.cursor()
+    try:
+        if not loader.fact_year_partitions(cur, table):
+            print(f"{table} is not partitioned; set partition_facts: true and run the loader first")
+            return
+        cur.execute(f"DROP TABLE IF EXISTS {flat}")
+        cur.execute(f"CREATE TABLE {flat} LIKE {table}")
+        cur.execute(f"ALTER TABLE {flat} REMOVE PARTITIONING")
+        cur.execute(f"INSERT INTO {flat} SELECT * FROM {table}")
+        conn.commit()
+        query = ("SELECT risk_factor_id, SUM(daly), SUM(attributable_daly) FROM {} "
+                 "WHERE data_year = %s GROUP BY risk_factor_id")
+
+        def run_query(t):
+            cur.execute(query.format(t), (args.year,))
+            return cur.fetchall()
+
+        t_flat, r_flat = _best_of(lambda: run_query(flat), args.repeat)
+        t_part, r_part = _best_of(lambda: run_query(table), args.repeat)
+        if sorted(r_flat) != sorted(r_part):
+            print("WARNING: query results differ between the two tables")
+
+        def upsert_year():
+            sql = loader.narrow_staging_sql(step["sql"], f"CAST(data_year AS UNSIGNED) = {args.year}")
+            for stmt in sql.split(";"):
+                if stmt.strip():
+                    cur.execute(stmt.strip() + ";")
+            conn.commit()
+
+        def exchange_year():
+            loader.exchange_fact_years(cur, dict(step, exchange_years=[args.year]))
+            conn.commit()
+
+        t_upsert, _ = _best_of(upsert_year, args.repeat)
+        with contextlib.redirect_stdout(io.StringIO()):
+            t_exchange, _ = _best_of(exchange_year, args.repeat)
+        cur.execute(f"DROP TABLE IF EXISTS {flat}")
+    finally:
+        cur.close()
+        conn.close()
+    print(f"{table}, data_year = {args.year}:")
+    print(f"  query, unpartitioned : {t_flat * 1000:.1f} ms")
+    print(f"  query, partitioned   : {t_part * 1000:.1f} ms")
+    print(f"  reload, upsert       : {t_upsert:.2f}s")
+    print(f"  reload, exchange     : {t_exchange:.2f}s")
+
+
+def _replicate_csv(path, times):
+    """Temporary copy of a CSV with its data lines repeated `times` times."""
+    with open(path, "r", encoding="utf-8") as f:
+        header, body = f.readline(), f.read()
+    if not body.endswith("\n"):
+        body += "\n"
+    fd, tmp = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(fd, "w", encoding="utf-8") as out:
+        out.write(header)
+        for _ in range(times):
+            out.write(body)
+    return tmp
+
+
+def _legacy_preprocess_biomarker_df(table, df: pd.DataFrame) -> pd.DataFrame:
+    """preprocess_biomarker_df as it was before vectorization (per-row apply); the timing baseline."""
+    if df is None or df.empty:
+        return df
+
+    # Normalise column names for detection (won't rename in-place yet)
+    norm_map = {c: c.strip() for c in df.columns}
+    df = df.rename(columns=norm_map)
+
+    # Ensure required columns exist
+    for col in ["sex", "indicator", "category", "survey_period", "value_pct", "est_thousand", "age_group", "note"]:
+        if col not in df.columns:
+            df[col] = None
+
+    # If CSV includes an auxiliary column like 'indicator.1', keep that info in note
+    if "indicator.1" in df.columns:
+        # Only fill note where it is missing/blank
+        mask_blank_note = df["note"].isna() | (df["note"].astype(str).str.strip() == "")
+        df.loc[mask_blank_note, "note"] = df.loc[mask_blank_note, "indicator.1"].astype(str).str.strip()
+
+    # Derive indicator/category if possible
+    # Pattern: parts separated by en-dash/"–" or hyphen "-"
+    def split_indicator(val):
+        if not isinstance(val, str) or not val.strip():
+            return (None, None)
+        s = str(val).strip()
+        # normalise dashes and collapse spaces
+        s = s.replace(" — ", " – ").replace(" - ", " – ")
+        parts = [p.strip() for p in s.split(" – ") if p.strip()]
+        if len(parts) >= 3:
+            # typical: <indicator> – <scope/None> – <category>
+            base = parts[0]
+            cat = parts[-1]
+            return (base, cat)
+        if len(parts) == 2:
+            base, cat = parts[0], parts[1]
+            return (base, cat)
+        return (s, None)
+
+    # Only overwrite when category missing
+    missing_cat = df["category"].isna() | (df["category"].astype(str).str.strip() == "")
+    if "indicator" in df.columns:
+        derived = df.loc[missing_cat, "indicator"].apply(split_indicator)
+        if not derived.empty:
+            df.loc[missing_cat, "indicator"] = derived.apply(lambda x: x[0])
+            df.loc[missing_cat, "category"] = derived.apply(lambda x: x[1])
+
+    # --- Normalise category labels to avoid duplicates like "30-44" vs "30–44" ---
+    def _normalise_category(val):
+        if val is None:
+            return None
+        s = str(val).strip()
+        if not s or s.lower() == 'nan':
+            return None
+        # remove trailing ABS-style footnote markers like (d), (e), etc.
+        s = re.sub(r"\(([a-z])\)$", "", s, flags=re.IGNORECASE).strip()
+        # 30-44 -> 30–44 (use en dash only when a hyphen separates digits)
+        s = re.sub(r"(?<=\d)\s*-\s*(?=\d)", "–", s)
+        # collapse multiple spaces
+        s = re.sub(r"\s+", " ", s)
+        return s
+
+    if "category" in df.columns:
+        df["category"] = df["category"].apply(_normalise_category)
+
+    # Drop non-analytic total/stat rows and denominator categories for biomarkers
+    def _is_total_or_stat(x):
+        if x is None:
+            return False
+        s = str(x).strip().lower()
+        return (
+            s.startswith('total ') or s.startswith('total,') or s == 'total' or
+            s.startswith('mean') or s.startswith('median') or
+            'total blood' in s or 'total urine' in s or '18 years and over' in s
+        )
+
+    # rows with empty category and notes indicating totals/means/medians should be removed
+    cat_blank = df["category"].isna() | (df["category"].astype(str).str.strip() == "")
+    note_total = df["note"].apply(_is_total_or_stat)
+    drop_mask = cat_blank & note_total
+
+    # also drop explicit denominator categories
+    denom_mask = df["category"].astype(str).str.contains(r"\bdenominator\b", case=False, na=False)
+
+    df = df[~(drop_mask | denom_mask)].reset_index(drop=True)
+
+    # Default survey period
+    if "survey_period" in df.columns:
+        df["survey_period"] = df["survey_period"].fillna("2022–24").replace("", "2022–24")
+    else:
+        df["survey_period"] = "2022–24"
+
+    # Guess percent column if value_pct empty
+    if (df["value_pct"].isna() | (df["value_pct"].astype(str).str.strip()=="")).all():
+        percent_cols = [c for c in df.columns if "%" in c or c.lower().strip() in ("percent", "percentage", "value (%)", "value_pct")]
+        for c in percent_cols:
+            try:
+                ser = df[c].astype(str).str.replace("%", "", regex=False).str.replace(",", "", regex=False)
+                df.loc[:, "value_pct"] = pd.to_numeric(ser, errors="coerce")
+                break
+            except Exception:
+                continue
+
+    # Guess estimate-thousand column if empty
+    if (df["est_thousand"].isna() | (df["est_thousand"].astype(str).str.strip()=="")).all():
+        thou_cols = [c for c in df.columns if "000" in c or c.lower().strip() in ("estimate_000", "est_thousand")]
+        for c in thou_cols:
+            try:
+                ser = df[c].astype(str).str.replace(",", "", regex=False)
+                df.loc[:, "est_thousand"] = pd.to_numeric(ser, errors="coerce")
+                break
+            except Exception:
+                continue
+
+    # Age-group fallback
+    if "age_group" in df.columns:
+        df["age_group"] = df["age_group"].fillna("All 18+").replace("", "All 18+")
+    else:
+        df["age_group"] = "All 18+"
+
+    return df
+
+
+def _read_biomarker_csv(path):
+    """Text read as read_staging_csv does it before preprocessing."""
+    return pd.read_csv(path, dtype=str, keep_default_na=True, na_values=loader.CSV_NA_VALUES)
+
+
+def _biomarker_golden_cases(path):
+    """
+    Raw biomarker frame, a variant with the category folded into the
+    indicator (exercises the splitter) and variants where note, category
+    and indicator are entirely missing (whole frame and a single row).
+    """
+    raw = _read_biomarker_csv(path)
+    folded = raw.copy()
+    if "category" in folded.columns and "indicator" in folded.columns:
+        cat = folded["category"].fillna("")
+        half = folded.index % 2 == 0
+        folded.loc[half, "indicator"] = folded.loc[half, "indicator"] + " – None – " + cat[half]
+        folded.loc[~half, "indicator"] = folded.loc[~half, "indicator"] + " - " + cat[~half]
+        folded["category"] = None
+    no_notes = raw.assign(note=None)
+    all_missing = raw.assign(note=None, category=None, indicator=None)
+    return {"raw": raw, "folded": folded, "no notes": no_notes, "all missing": all_missing,
+            "one row, no note": no_notes.head(1), "one row, all missing": all_missing.head(1)}
+
+
+def _biomarker_table(path):
+    return "stg_biomarkers_kidney" if "kidney" in os.path.basename(path) else "stg_biomarkers_liver"
+
+
+def _same_frame(a, b):
+    return a.columns.equals(b.columns) and a.dtypes.equals(b.dtypes) and a.equals(b)
+
+
+def bench_biomarkers(args):
+    """Golden check of the vectorized preprocess_biomarker_df against the per-row version, then time both."""
+    ok = True
+    for path in args.csv:
+        table = _biomarker_table(path)
+        for label, df in _biomarker_golden_cases(path).items():
+            same = _same_frame(_legacy_preprocess_biomarker_df(table, df.copy()),
+                               loader.preprocess_biomarker_df(table, df.copy()))
+            ok &= same
+            print(f"{os.path.basename(path)} [{label}]: {'identical' if same else 'DIFFERS'}")
+    if not ok:
+        print("WARNING: vectorized output differs from the per-row version")
+    for path in args.csv:
+        tmp = _replicate_csv(path, args.replicate)
+        try:
+            df = _read_biomarker_csv(tmp)
+        finally:
+            os.remove(tmp)
+        table = _biomarker_table(path)
+        t_old, _ = _best_of(lambda: _legacy_preprocess_biomarker_df(table, df.copy()), args.repeat)
+        t_new, _ = _best_of(lambda: loader.preprocess_biomarker_df(table, df.copy()), args.repeat)
+        print(f"{os.path.basename(path)} x{args.replicate}: {len(df)} rows")
+        print(f"  per-row apply : {t_old:.3f}s")
+        print(f"  vectorized    : {t_new:.3f}s")
+        print(f"  speedup       : {t_old / t_new:.1f}x")
+    if not ok:
+        sys.exit(1)
+
+
+def _legacy_preprocess_nhs_cube_df(df: pd.DataFrame) -> pd.DataFrame:
+    """preprocess_nhs_cube_df as it was before vectorization (per-row norm_text); the timing baseline."""
+    if df is None or df.empty:
+        return df
+    # Ensure required columns
+    for col in ["sex","age_group","indicator","category","survey_period","value_pct","est_thousand","note"]:
+        if col not in df.columns:
+            df[col] = None
+
+    # Normalise dashes/whitespace
+    def norm_text(s):
+        if pd.isna(s): return s
+        t = str(s).strip()
+        t = re.sub(r"(?<=\d)\s*-\s*(?=\d)", "–", t)  # 45-54 -> 45–54
+        t = re.sub(r"\s+", " ", t)
+        return t
+    for col in ["sex","age_group","indicator","category","survey_period","note"]:
+        df[col] = df[col].apply(norm_text)
+
+    # Normalise sexes & periods
+    df["sex"] = df["sex"].replace({"Male":"Males","Female":"Females"}).fillna("Persons").replace({"": "Persons"})
+    df["age_group"] = df["age_group"].replace({"18 years and over":"All 18+"}).fillna("All 18+").replace({"": "All 18+"})
+    df["survey_period"] = df["survey_period"].replace({"2022-24":"2022–24","2022–2024":"2022–24"}).fillna("2022–24")
+
+    # Drop non-analytic categories & indicators
+    drop_mask = (
+        df["category"].fillna("").astype(str).str.match(loader.FOOTNOTE_RE_DIET)
+        | df["indicator"].fillna("").astype(str).str.match(loader.FOOTNOTE_RE_DIET)
+    )
+    df = df[~drop_mask].copy()
+
+    # Coerce numerics
+    for col in ["value_pct","est_thousand"]:
+        df[col] = (df[col].astype(str)
+                           .str.replace("%","", regex=False)
+                           .str.replace(",","", regex=False))
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    return df
+
+
+def bench_cube(args):
+    """Golden check of the vectorized preprocess_nhs_cube_df against norm_text, then time both on ~N rows."""
+    raw = pd.read_csv(args.csv, dtype=str, keep_default_na=True, na_values=loader.CSV_NA_VALUES)
+    same = _same_frame(_legacy_preprocess_nhs_cube_df(raw.copy()), loader.preprocess_nhs_cube_df(raw.copy()))
+    print(f"{os.path.basename(args.csv)}: {'identical' if same else 'DIFFERS'}")
+    times = max(1, -(-args.rows // len(raw)))
+    df = pd.concat([raw] * times, ignore_index=True)
+    t_old, old = _best_of(lambda: _legacy_preprocess_nhs_cube_df(df.copy()), args.repeat)
+    t_new, new = _best_of(lambda: loader.preprocess_nhs_cube_df(df.copy()), args.repeat)
+    same_big = _same_frame(old, new)
+    print(f"{os.path.basename(args.csv)} x{times}: {len(df)} rows{'' if same_big else ' (outputs DIFFER)'}")
+    print(f"  per-row norm_text : {t_old:.3f}s")
+    print(f"  vectorized uniques: {t_new:.3f}s")
+    print(f"  speedup           : {t_old / t_new:.1f}x")
+    if not (same and same_big):
+        print("WARNING: vectorized output differs from the per-row version")
+        sys.exit(1)
+
+
+def _stream_worker(args):
+    """Child process: read + preprocess + row conversion in one mode, report peak RSS as JSON."""
+    t0 = time.perf_counter()
+    rows = 0
+    if args.worker == "whole":
+        rows = len(loader.dataframe_to_rows(loader.read_staging_csv(args.csv, args.table)))
+    else:
+        for df in loader.iter_staging_csv(args.csv, args.table, args.chunk_rows):
+            rows += len(loader.dataframe_to_rows(df))
+    print(json.dumps({"rows": rows, "seconds": time.perf_counter() - t0, "peak_rss_mb": loader.peak_rss_mb()}))
+
+
+def bench_stream(args):
+    """Peak RSS and time of whole-file vs chunked staging reads, each in a fresh process (no database)."""
+    if args.worker:
+        return _stream_worker(args)
+    path = _replicate_csv(args.csv, args.replicate) if args.replicate > 1 else args.csv
+    try:
+        results = {}
+        for mode in ("whole", "stream"):
+            cmd = [sys.executable, os.path.abspath(__file__), "stream", "--worker", mode,
+                   "--csv", path, "--table", args.table, "--chunk-rows", str(args.chunk_rows)]
+            out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+            results[mode] = json.loads(out.strip().splitlines()[-1])
+    finally:
+        if path != args.csv:
+            os.remove(path)
+    print(f"{args.csv} x{args.replicate} ({args.table}), chunk {args.chunk_rows} rows")
+    for mode, label in (("whole", "whole file"), ("stream", "streamed  ")):
+        r = results[mode]
+        print(f"  {label}: {r['rows']} rows in {r['seconds']:.2f}s, peak RSS {r['peak_rss_mb']:.0f} MiB")
+    if results["whole"]["rows"] != results["stream"]["rows"]:
+        print("WARNING: row counts differ between the two modes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HealthyLife loader micro-benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("convert", help="DataFrame -> row tuple conversion (S9 CSV)")
+    p.add_argument("--csv", default=S9_CSV)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_convert)
+
+    p = sub.add_parser("nutrition", help="Nutrition table reload, per-row vs batched (needs MySQL)")
+    p.add_argument("--config", default="backend/loader.yml")
+    p.set_defaults(func=bench_nutrition)
+
+    p = sub.add_parser("reset", help="DELETE vs TRUNCATE reset of the nutrition tables (needs MySQL, commits)")
+    p.add_argument("--config", default="backend/loader.yml")
+    p.set_defaults(func=bench_reset)
+
+    p = sub.add_parser("indexes", help="Transform with vs without staging indexes (needs MySQL + loaded staging)")
+    p.add_argument("--config", default="backend/loader.yml")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_indexes)
+
+    p = sub.add_parser("partitions", help="Single-year query / reload on the partitioned S9 fact (needs MySQL)")
+    p.add_argument("--config", default="backend/loader.yml")
+    p.add_argument("--year", type=int, default=2018)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_partitions)
+
+    p = sub.add_parser("stream", help="Peak RSS, whole-file vs chunked CSV reads (S9 CSV, no database)")
+    p.add_argument("--csv", default=S9_CSV)
+    p.add_argument("--table", default="stg_s9_risk_unadj")
+    p.add_argument("--replicate", type=int, default=20, help="repeat the data lines to enlarge the file")
+    p.add_argument("--chunk-rows", type=int, default=20000)
+    p.add_argument("--worker", choices=["whole", "stream"], help=argparse.SUPPRESS)
+    p.set_defaults(func=bench_stream)
+
+    p = sub.add_parser("biomarkers", help="Golden check + timing of vectorized biomarker preprocessing (no database)")
+    p.add_argument("--csv", nargs="+", default=BIOMARKER_CSVS)
+    p.add_argument("--replicate", type=int, default=100, help="repeat the data lines to enlarge the input")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_biomarkers)
+
+    p = sub.add_parser("cube", help="Golden check + timing of vectorized NHS cube preprocessing (no database)")
+    p.add_argument("--csv", default=CUBE09_CSV)
+    p.add_argument("--rows", type=int, default=1_000_000, help="replicate the cube up to this many rows")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_cube)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
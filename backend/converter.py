@@ -1,8 +1,9 @@
 import pandas as pd
 import os
+import sys
 
 # 1.data readin
-folder = "./datasets/"   
+folder = sys.argv[1] if len(sys.argv) > 1 else "./datasets/"   # the US31 folder
 food_file = os.path.join(folder, "Nutrient/master_nutrients_final.csv")
 recom_file = os.path.join(folder, "AusNutri_Recom/Final_nutritionRecom.csv")
 food_df = pd.read_csv(food_file)
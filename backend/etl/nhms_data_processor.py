@@ -6,6 +6,8 @@ import logging
 from dataclasses import dataclass
 from datetime import datetime
 
+from workbook_cache import open_workbook
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -125,7 +127,7 @@ class NHMSDataProcessor:
     def read_excel_file(self, file_path: str) -> Dict[str, pd.DataFrame]:
         """Read all sheets from the Excel file"""
         try:
-            excel_data = pd.read_excel(file_path, sheet_name=None, header=None)
+            excel_data = open_workbook(file_path).parse_all()
             logger.info(f"Successfully read Excel file with {len(excel_data)} sheets")
             return excel_data
         except Exception as e:
@@ -2,6 +2,8 @@ import pandas as pd
 import re
 from pathlib import Path
 
+from workbook_cache import open_workbook
+
 # -----------------------------------------------------------------
 # Helpers (simple & reusable)
 # -----------------------------------------------------------------
@@ -124,7 +126,7 @@ def process_chronic_biomarkers(xlsx_path):
     ]
     DIABETES_PREFIXES = ["Has diabetes", "Does not have diabetes"]
 
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = _pick_sheet(xl, needle="table 26.1")
     df = xl.parse(sheet, header=None)
 
@@ -286,7 +288,7 @@ def process_risk_factors(xlsx_path):
     Parse NHMSDC10 Table 10.1.
     Returns: data_df (counts) and denom_df (denominators per risk-factor column)
     """
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = next(s for s in xl.sheet_names if "table 10.1" in s.lower())
     df = xl.parse(sheet, header=None)
 
@@ -372,7 +374,7 @@ def process_risk_factors(xlsx_path):
 # ----------------------------------------------------------------------
 def process_nutrient_biomarkers_females(xlsx_path):
     """Return tidy rows with mean/median/IQR counts & denominators by age."""
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = next(s for s in xl.sheet_names if "table 25.1" in s.lower())
     df = xl.parse(sheet, header=None)
 
@@ -489,7 +491,7 @@ def process_nutrient_biomarkers_years(xlsx_path):
       - category counts (in '000)
       - denominators from 'Total ... results' rows
     """
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = next(s for s in xl.sheet_names if "table 27.1" in s.lower())
     df = xl.parse(sheet, header=None)
 
@@ -608,7 +610,7 @@ def process_nutrient_biomarkers_years(xlsx_path):
 # Table 22.1 (NHMSDC22): Vitamin D status by season and state/territory
 # ----------------------------------------------------------------------
 def process_vitaminD_season_state(xlsx_path):
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = next(s for s in xl.sheet_names if "table 22.1" in s.lower())
     df = xl.parse(sheet, header=None)
 
@@ -677,7 +679,7 @@ def process_vitaminD_season_state(xlsx_path):
 # Table 8.1 (NHMSDC08): Kidney biomarkers by sex (Persons)
 # ---------------------------------------------------------
 def process_kidney_biomarkers(xlsx_path):
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = next(s for s in xl.sheet_names if "table 8.1" in s.lower())
     df = xl.parse(sheet, header=None)
 
@@ -737,7 +739,7 @@ def process_kidney_biomarkers(xlsx_path):
 # Table 9.1 (NHMSDC09): Liver biomarkers by sex (ALT/AST)
 # -------------------------------------------------------
 def process_liver_biomarkers(xlsx_path):
-    xl = pd.ExcelFile(xlsx_path)
+    xl = open_workbook(xlsx_path)
     sheet = next(s for s in xl.sheet_names if "table 9.1" in s.lower())
     df = xl.parse(sheet, header=None)
 
@@ -1,6 +1,8 @@
 import pandas as pd
 import re
 
+from workbook_cache import open_workbook
+
 # ---------------------------
 # Small, simple, shared utils
 # ---------------------------
@@ -70,11 +72,11 @@ def process_chronic_biomarkers(filepath, sheet_name=None):
     """
     if sheet_name is None:
         # auto-pick a sheet containing "table 26.1" and "estimate"
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 26.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
 
     hdr = find_header_row(df)
     # Years are in the header row (skip first column which is label)
@@ -156,11 +158,11 @@ def process_risk_factors(filepath, sheet_name=None):
     Returns: data_df, denom_df
     """
     if sheet_name is None:
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 10.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
     df = df.copy()
 
     hdr = find_header_row(df)
@@ -267,11 +269,11 @@ def process_nutrient_biomarkers_females(filepath, sheet_name=None):
     Returns a tidy DataFrame with measures: mean, median, iqr_low, iqr_high, count_000, denominators.
     """
     if sheet_name is None:
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 25.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
     hdr = find_header_row(df)
     age_cols = [clean_label_keep_units(x) for x in df.loc[hdr, 1:].dropna().tolist()]
     age_idx = list(range(1, 1 + len(age_cols)))
@@ -345,11 +347,11 @@ def process_nutrient_biomarkers_females(filepath, sheet_name=None):
 def process_nutrient_biomarkers_years(filepath, sheet_name=None):
     """Parse Table 27.1 (nutrient biomarkers by year)."""
     if sheet_name is None:
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 27.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
     hdr = find_header_row(df)
     years = [clean_label_keep_units(x) for x in df.loc[hdr, 1:].dropna().tolist()]
     year_cols = list(range(1, 1 + len(years)))
@@ -426,11 +428,11 @@ def _classify_vitd(text):
 def process_vitaminD_season_state(filepath, sheet_name=None):
     """Parse Table 22.1 (vitamin D status by season and state)."""
     if sheet_name is None:
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 22.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
     hdr = find_header_row(df)
     states = [clean_label_keep_units(x) for x in df.loc[hdr, 1:].dropna().tolist()]
     state_cols = list(range(1, 1 + len(states)))
@@ -479,11 +481,11 @@ def process_vitaminD_season_state(filepath, sheet_name=None):
 def process_kidney_biomarkers(filepath, sheet_name=None):
     """Parse Table 8.1 (kidney disease biomarkers by sex)."""
     if sheet_name is None:
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 8.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
     hdr = find_header_row(df)
     sexes = [clean_label_keep_units(x) for x in df.loc[hdr, 1:].dropna().tolist()]
     sex_cols = list(range(1, 1 + len(sexes)))
@@ -535,11 +537,11 @@ def process_kidney_biomarkers(filepath, sheet_name=None):
 def process_liver_biomarkers(filepath, sheet_name=None):
     """Parse Table 9.1 (liver function biomarkers by sex)."""
     if sheet_name is None:
-        xl = pd.ExcelFile(filepath)
+        xl = open_workbook(filepath)
         picks = [s for s in xl.sheet_names if "table 9.1" in s.lower() and "estimate" in s.lower()]
         sheet_name = picks[0] if picks else xl.sheet_names[0]
 
-    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+    df = open_workbook(filepath).parse(sheet_name, header=None)
     hdr = find_header_row(df)
     sexes = [clean_label_keep_units(x) for x in df.loc[hdr, 1:].dropna().tolist()]
     sex_cols = list(range(1, 1 + len(sexes)))
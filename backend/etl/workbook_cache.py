@@ -0,0 +1,153 @@
+"""
+Sheet cache for the NHMS workbooks (data_raw/NHMSDC*.xlsx).
+
+Parsing .xlsx through openpyxl is most of the ETL's run time, and every
+process_* function opens its workbook again. open_workbook() returns a stand-in
+for pd.ExcelFile (sheet_names, parse(sheet, header=None)) that:
+
+  - parses each sheet at most once per process (in-memory memo), and
+  - persists each raw grid as a pickle keyed by the pandas version, the
+    workbook's SHA-256 and the sheet name, so re-running the ETL after a code
+    change reads no Excel at all.
+
+An edited workbook hashes differently and is parsed again, as is every sheet
+after a pandas upgrade; a cache file that cannot be read (truncated, foreign)
+is re-parsed from Excel and rewritten. The cache lives in
+<workbook dir>/.sheet_cache; NHMS_SHEET_CACHE=<dir> moves it and
+NHMS_SHEET_CACHE=off keeps only the in-memory memo.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+CACHE_ENV = "NHMS_SHEET_CACHE"
+CACHE_DIRNAME = ".sheet_cache"
+
+_OPEN = {}  # (abs path, mtime_ns, size) -> CachedWorkbook
+
+
+def file_sha256(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_root(path):
+    """Directory holding the sheet caches for `path`, or None when disabled."""
+    env = os.environ.get(CACHE_ENV, "")
+    if env.lower() in ("0", "off", "no", "false"):
+        return None
+    return env or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIRNAME)
+
+
+def _atomic_write(path, write):
+    """write(tmp_path) then rename into place, so parallel ETL workers never read a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class CachedWorkbook:
+    """The part of pd.ExcelFile the ETL uses, served from the sheet cache."""
+
+    def __init__(self, path, root=None):
+        self.path = path
+        self.sha256 = file_sha256(path)
+        # pickles are only readable by a compatible pandas: key on its version too
+        self.cache_dir = os.path.join(root, f"pandas-{pd.__version__}", self.sha256) if root else None
+        self.parsed = 0          # sheets read from Excel (cache misses) in this process
+        self._xl = None
+        self._sheets = {}
+        self.sheet_names = self._load_sheet_names()
+
+    def _excel(self):
+        if self._xl is None:
+            self._xl = pd.ExcelFile(self.path)
+        return self._xl
+
+    def _cache_file(self, name):
+        return os.path.join(self.cache_dir, name) if self.cache_dir else None
+
+    def _sheet_file(self, sheet):
+        # sheet names carry spaces, dots and brackets; hash them into a file name
+        return self._cache_file(hashlib.sha1(sheet.encode("utf-8")).hexdigest()[:16] + ".pkl")
+
+    def _load_sheet_names(self):
+        index = self._cache_file("sheets.json")
+        if index and os.path.exists(index):
+            try:
+                with open(index, encoding="utf-8") as f:
+                    names = json.load(f)
+                if isinstance(names, list) and all(isinstance(n, str) for n in names):
+                    return names
+            except (OSError, ValueError):
+                pass
+            print(f"WARN: unreadable sheet cache {index}; re-reading {self.path}")
+        names = list(self._excel().sheet_names)
+        if index:
+            def dump(tmp):
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(names, f)
+            _atomic_write(index, dump)
+        return names
+
+    def _read_cached(self, cached):
+        """A cached grid, or None (after a warning) when the file cannot be unpickled."""
+        try:
+            df = pd.read_pickle(cached)
+            if not isinstance(df, pd.DataFrame):
+                raise TypeError(f"holds a {type(df).__name__}")
+        except Exception as e:
+            print(f"WARN: unreadable sheet cache {cached} ({type(e).__name__}); re-parsing {self.path}")
+            return None
+        return df
+
+    def parse(self, sheet_name=0, header=None):
+        """Raw grid of one sheet (by name or position), as pd.read_excel(..., header=None)."""
+        if header is not None:
+            raise ValueError("the sheet cache stores raw grids only; parse with header=None")
+        if isinstance(sheet_name, int):
+            sheet_name = self.sheet_names[sheet_name]
+        if sheet_name not in self.sheet_names:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found in {self.path}")
+        if sheet_name not in self._sheets:
+            cached = self._sheet_file(sheet_name)
+            df = self._read_cached(cached) if cached and os.path.exists(cached) else None
+            if df is None:
+                df = self._excel().parse(sheet_name, header=None)
+                self.parsed += 1
+                if cached:
+                    _atomic_write(cached, df.to_pickle)
+            self._sheets[sheet_name] = df
+        # callers edit their grid in place; keep the memo pristine
+        return self._sheets[sheet_name].copy()
+
+    def parse_all(self):
+        """{sheet name: raw grid} in workbook order, as pd.read_excel(..., sheet_name=None, header=None)."""
+        return {name: self.parse(name) for name in self.sheet_names}
+
+
+def open_workbook(path):
+    """CachedWorkbook for `path`, shared by every caller in this process until the file changes."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    wb = _OPEN.get(key)
+    if wb is None:
+        wb = _OPEN[key] = CachedWorkbook(path, cache_root(path))
+    return wb
+
+
+def read_sheet(path, sheet_name=0):
+    return open_workbook(path).parse(sheet_name, header=None)
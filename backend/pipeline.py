@@ -0,0 +1,354 @@
+"""
+Pipeline runner: raw workbooks -> cleaned CSVs -> nutrition CSVs -> MySQL.
+
+Each step of the data path (the NHMS workbook ETL, fix_csv_headers, the US31
+nutrition scripts and loader.py) is declared as a task with file inputs and
+outputs. A task depends on every task producing one of its inputs, runs only
+when an output is missing or older than an input, and independent tasks run
+in parallel (one subprocess each). Changing one raw workbook therefore only
+redoes its ETL task and what reads its CSVs.
+
+Run from the repository root, e.g.:
+    python backend/pipeline.py                    # everything that is out of date
+    python backend/pipeline.py --dry-run          # show what would run and why
+    python backend/pipeline.py etl_nhmsdc26 --jobs 4
+    python backend/pipeline.py --force --report pipeline_report.json
+"""
+from __future__ import annotations
+import os
+import sys
+import glob
+import json
+import time
+import shlex
+import fnmatch
+import argparse
+import importlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import loader  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PIPELINE = "backend/pipeline.py"
+STAMP_DIR = "backend/.pipeline"  # stamp files of tasks without file outputs, and task logs
+
+# ----------------------------------------------------------------------
+#  Task declarations
+# ----------------------------------------------------------------------
+# NHMS workbooks: (workbook in data_raw, process_* function, CSVs in
+# data_clean in the order the function returns its frames)
+ETL_WORKBOOKS = [
+    ("NHMSDC26.xlsx", "process_chronic_biomarkers",
+     ["chronic_indicators.csv", "chronic_prevalence.csv", "chronic_denominators.csv"]),
+    ("NHMSDC10.xlsx", "process_risk_factors", ["riskfactor_indicators.csv", "riskfactor_denominators.csv"]),
+    ("NHMSDC25.xlsx", "process_nutrient_biomarkers_females", ["nutrient_females.csv"]),
+    ("NHMSDC27.xlsx", "process_nutrient_biomarkers_years", ["nutrient_years.csv"]),
+    ("NHMSDC22.xlsx", "process_vitaminD_season_state", ["vitaminD_season_state.csv"]),
+    ("NHMSDC08.xlsx", "process_kidney_biomarkers", ["kidney_biomarkers.csv"]),
+    ("NHMSDC09.xlsx", "process_liver_biomarkers", ["liver_biomarkers.csv"]),
+]
+
+# etl/nhmsdc26_table26_1.py is the older parser for the same tables; its
+# process_chronic_biomarkers returns no prevalence frame
+ETL_OUTPUT_OVERRIDES = {
+    "nhmsdc26_table26_1": {
+        "process_chronic_biomarkers": ["chronic_indicators.csv", "chronic_denominators.csv"],
+    },
+}
+
+US31 = "backend/datasets/US31"
+LOADER_ARGS = "--create-staging --load-csvs --transform --run-scripts"
+
+
+def _stamp(name):
+    return f"{STAMP_DIR}/{name}.stamp"
+
+
+def loader_inputs(config):
+    """Files loader.py reads with the given config: staging CSVs, nutrition CSVs, optional SQL."""
+    cfg = yaml.safe_load(open(os.path.join(ROOT, config), "r", encoding="utf-8"))
+    nutrition_dir = cfg.get("nutrition_dir", loader.NUTRITION_DIR)
+    files = [item["path"] for item in cfg.get("files", [])]
+    files += [f"{nutrition_dir}/{file_name}" for _, file_name, _ in loader.NUTRITION_FILES]
+    files += [p for p in (cfg.get("optional_sql") or {}).values() if p]
+    return [config, "backend/loader.py"] + files
+
+
+def build_tasks(etl_module="nhms_etl", config="backend/loader.yml", loader_args=LOADER_ARGS):
+    """
+    The pipeline as a list of tasks in a valid run order: dicts with name,
+    cmd (argv), cwd (relative to the repository root), inputs (paths or
+    globs) and outputs (paths; *.stamp outputs are written by the runner).
+    """
+    tasks = []
+    overrides = ETL_OUTPUT_OVERRIDES.get(etl_module, {})
+    for workbook, func, outputs in ETL_WORKBOOKS:
+        outputs = [f"backend/data_clean/{name}" for name in overrides.get(func, outputs)]
+        tasks.append({
+            "name": f"etl_{os.path.splitext(workbook)[0].lower()}",
+            "cmd": [sys.executable, PIPELINE, "--etl-worker", etl_module, func,
+                    f"backend/data_raw/{workbook}", *outputs],
+            "cwd": ".",
+            "inputs": [f"backend/data_raw/{workbook}", f"backend/etl/{etl_module}.py",
+                       "backend/etl/workbook_cache.py"],
+            "outputs": outputs,
+        })
+    tasks += [
+        {
+            # rewrites the known staging CSVs in place
+            "name": "fix_csv_headers",
+            "cmd": [sys.executable, "etl/fix_csv_headers.py", "data_clean"],
+            "cwd": "backend",
+            "inputs": ["backend/data_clean/*.csv", "backend/etl/fix_csv_headers.py"],
+            "outputs": [_stamp("fix_csv_headers")],
+        },
+        {
+            "name": "clean_nutrients",
+            "cmd": [sys.executable, "clean_python.py"],
+            "cwd": f"{US31}/Nutrient",
+            "inputs": [f"{US31}/Nutrient/Release 2 - *.xlsx", f"{US31}/Nutrient/clean_python.py"],
+            "outputs": [f"{US31}/Nutrient/master_nutrients_final.csv"],
+        },
+        {
+            # every output, including the nutrition_recommendations_long.csv
+            # intermediate, is committed: a missing one would rerun this task
+            # and everything downstream of it on a fresh checkout
+            "name": "converter",
+            "cmd": [sys.executable, "backend/converter.py", US31],
+            "cwd": ".",
+            "inputs": [f"{US31}/Nutrient/master_nutrients_final.csv",
+                       f"{US31}/AusNutri_Recom/Final_nutritionRecom.csv", "backend/converter.py"],
+            "outputs": [f"{US31}/output/food_nutrients_long.csv", f"{US31}/output/nutrient_dimension.csv",
+                        f"{US31}/output/nutrition_recommendations_long.csv"],
+        },
+        {
+            "name": "age_bracketer",
+            "cmd": [sys.executable, "backend/age_bracketer.py", US31],
+            "cwd": ".",
+            "inputs": [f"{US31}/output/nutrition_recommendations_long.csv", "backend/age_bracketer.py"],
+            "outputs": [f"{US31}/output/nutrition_recommendations_refined.csv"],
+        },
+        # no task for output/NutritionRecom_to_sql.py: loader.py loads the
+        # nutrition CSVs directly (load_nutrition_tables) and nothing reads
+        # the insert_data.sql it writes
+        {
+            "name": "loader",
+            "cmd": [sys.executable, "backend/loader.py", "--config", config, *shlex.split(loader_args)],
+            "cwd": ".",
+            "inputs": loader_inputs(config) + [_stamp("fix_csv_headers")],
+            "outputs": [_stamp("loader")],
+        },
+    ]
+    return tasks
+
+# ----------------------------------------------------------------------
+#  Dependencies and staleness
+# ----------------------------------------------------------------------
+def _abs(path):
+    return os.path.join(ROOT, path)
+
+
+def expand_inputs(patterns):
+    """Existing files matched by the input paths / globs (relative to the repository root)."""
+    files = []
+    for pattern in patterns:
+        files.extend(os.path.relpath(p, ROOT) for p in sorted(glob.glob(_abs(pattern))))
+    return files
+
+
+def task_dependencies(tasks):
+    """name -> set of task names producing one of its inputs (tasks must be in run order)."""
+    deps, producers = {}, []
+    for task in tasks:
+        deps[task["name"]] = set()
+        for name, outputs in producers:
+            if any(fnmatch.fnmatch(out, pattern) for out in outputs for pattern in task["inputs"]):
+                deps[task["name"]].add(name)
+        producers.append((task["name"], task["outputs"]))
+    for task in tasks:
+        later = [n for n, outputs in producers
+                 if n not in deps[task["name"]] and n != task["name"]
+                 and any(fnmatch.fnmatch(out, pattern) for out in outputs for pattern in task["inputs"])]
+        if later:
+            raise ValueError(f"{task['name']} reads outputs of later task(s) {', '.join(later)}")
+    return deps
+
+
+def out_of_date(task):
+    """Why the task has to run (missing output / newer input), or None when it is up to date."""
+    missing = [p for p in task["outputs"] if not os.path.exists(_abs(p))]
+    if missing:
+        return f"missing {os.path.basename(missing[0])}"
+    inputs = expand_inputs(task["inputs"])
+    if not inputs:
+        return None
+    oldest_out = min(os.path.getmtime(_abs(p)) for p in task["outputs"])
+    newest_in = max(inputs, key=lambda p: os.path.getmtime(_abs(p)))
+    if os.path.getmtime(_abs(newest_in)) > oldest_out:
+        return f"{os.path.basename(newest_in)} changed"
+    return None
+
+
+def select_tasks(tasks, deps, targets):
+    """The target tasks plus everything upstream of them, in run order."""
+    if not targets:
+        return tasks
+    unknown = set(targets) - set(deps)
+    if unknown:
+        raise ValueError(f"unknown task(s): {', '.join(sorted(unknown))}")
+    keep, todo = set(), list(targets)
+    while todo:
+        name = todo.pop()
+        if name not in keep:
+            keep.add(name)
+            todo.extend(deps[name])
+    return [task for task in tasks if task["name"] in keep]
+
+# ----------------------------------------------------------------------
+#  Runner
+# ----------------------------------------------------------------------
+def run_task(task):
+    """Run one task as a subprocess (output to its log file); check and stamp its outputs."""
+    log_path = _abs(f"{STAMP_DIR}/{task['name']}.log")
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.run(task["cmd"], cwd=_abs(task["cwd"]), stdout=log, stderr=subprocess.STDOUT)
+    if proc.returncode:
+        raise RuntimeError(f"exit code {proc.returncode}, see {os.path.relpath(log_path, ROOT)}")
+    for out in task["outputs"]:
+        if out.endswith(".stamp"):
+            with open(_abs(out), "w", encoding="utf-8") as f:
+                f.write(time.strftime("%Y-%m-%dT%H:%M:%S\n"))
+        elif not os.path.exists(_abs(out)):
+            raise RuntimeError(f"did not write {out}")
+
+
+def run_pipeline(tasks, jobs, force=False, dry_run=False):
+    """
+    Run out-of-date tasks as soon as their upstream tasks are done, up to
+    `jobs` at a time. Returns name -> {status, start, end, reason}; status is
+    ran / skipped / failed / blocked (upstream failed) / would run (dry run).
+    A failure stops new tasks from starting; running ones are waited for.
+    """
+    os.makedirs(_abs(STAMP_DIR), exist_ok=True)
+    deps = task_dependencies(tasks)
+    by_name = {task["name"]: task for task in tasks}
+    pending = {task["name"]: deps[task["name"]] & set(by_name) for task in tasks}
+    results, running, ran = {}, {}, set()
+    failed = False
+    t0 = time.perf_counter()
+
+    def finish(name, status, reason, start=None):
+        now = time.perf_counter() - t0
+        results[name] = {"status": status, "start": now if start is None else start, "end": now, "reason": reason}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            for name in [n for n, d in pending.items() if d <= set(results)]:
+                del pending[name]
+                upstream = deps[name] & set(by_name)
+                if failed:
+                    finish(name, "blocked", "stopped after a failure")
+                    continue
+                if force:
+                    reason = "forced"
+                elif dry_run and upstream & ran:
+                    reason = "upstream would run"
+                else:
+                    reason = out_of_date(by_name[name])
+                if reason is None:
+                    finish(name, "skipped", "up to date")
+                elif dry_run:
+                    ran.add(name)
+                    finish(name, "would run", reason)
+                else:
+                    print(f"[{time.perf_counter() - t0:7.2f}s] start {name} ({reason})")
+                    running[executor.submit(run_task, by_name[name])] = (name, reason, time.perf_counter() - t0)
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, reason, start = running.pop(fut)
+                try:
+                    fut.result()
+                    ran.add(name)
+                    finish(name, "ran", reason, start)
+                    print(f"[{time.perf_counter() - t0:7.2f}s] done  {name}")
+                except Exception as e:
+                    failed = True
+                    finish(name, "failed", str(e), start)
+                    print(f"[{time.perf_counter() - t0:7.2f}s] FAILED {name}: {e}")
+    return results
+
+
+def print_pipeline_report(tasks, results):
+    """Per-task table (status, start/end offsets, duration, reason) and the critical path."""
+    deps = task_dependencies(tasks)
+    print(f"{'task':<20}{'status':<11}{'start s':>9}{'end s':>9}{'dur s':>9}  reason")
+    for task in tasks:
+        r = results[task["name"]]
+        print(f"{task['name']:<20}{r['status']:<11}{r['start']:>9.2f}{r['end']:>9.2f}"
+              f"{r['end'] - r['start']:>9.2f}  {r['reason']}")
+    timings = {name: (r["start"], r["end"]) for name, r in results.items()}
+    path, total = loader.critical_path({t["name"]: deps[t["name"]] & set(timings) for t in tasks}, timings)
+    wall = max((end for _, end in timings.values()), default=0.0)
+    print(f"Critical path ({total:.2f}s of {wall:.2f}s wall): {' -> '.join(path)}")
+
+
+def etl_worker(module_name, func_name, xlsx, outputs):
+    """Child process of an ETL task: run one process_* function and save its frames to outputs."""
+    sys.path.insert(0, os.path.join(ROOT, "backend", "etl"))
+    frames = getattr(importlib.import_module(module_name), func_name)(xlsx)
+    frames = frames if isinstance(frames, tuple) else (frames,)
+    if len(frames) != len(outputs):
+        raise SystemExit(f"{func_name} returned {len(frames)} frames for {len(outputs)} outputs")
+    for df, path in zip(frames, outputs):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=False)
+        print(f"Wrote {path} ({len(df)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HealthyLife data pipeline (ETL -> nutrition -> loader)")
+    parser.add_argument("targets", nargs="*", help="Tasks to bring up to date (with their upstream tasks); default all")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Tasks run in parallel")
+    parser.add_argument("--force", action="store_true", help="Run the selected tasks even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Only show which tasks would run and why")
+    parser.add_argument("--etl-module", choices=["nhms_etl", "nhmsdc26_table26_1"], default="nhms_etl",
+                        help="Parser module for the NHMS workbooks (backend/etl)")
+    parser.add_argument("--config", default="backend/loader.yml", help="loader.py config")
+    parser.add_argument("--loader-args", default=LOADER_ARGS, help="Arguments passed to loader.py")
+    parser.add_argument("--list", action="store_true", help="List the tasks with their dependencies")
+    parser.add_argument("--report", default=None, help="Write the per-task timings as JSON")
+    parser.add_argument("--etl-worker", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.etl_worker:
+        module_name, func_name, xlsx, *outputs = args.etl_worker
+        return etl_worker(module_name, func_name, xlsx, outputs)
+
+    tasks = build_tasks(args.etl_module, args.config, args.loader_args)
+    deps = task_dependencies(tasks)
+    if args.list:
+        for task in tasks:
+            print(f"{task['name']:<20}after {', '.join(sorted(deps[task['name']])) or '-'}")
+        return
+    try:
+        tasks = select_tasks(tasks, deps, args.targets)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    results = run_pipeline(tasks, max(1, args.jobs), force=args.force, dry_run=args.dry_run)
+    print_pipeline_report(tasks, results)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump([{"task": t["name"], **results[t["name"]]} for t in tasks], f, indent=2)
+        print(f"Report written to {args.report}")
+    if any(r["status"] == "failed" for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
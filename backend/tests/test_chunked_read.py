@@ -0,0 +1,48 @@
+"""iter_staging_csv must yield, for any chunk size, the frame read_staging_csv returns."""
+import os
+
+import pandas as pd
+import pytest
+
+import loader
+from conftest import BACKEND
+
+# (clean CSV, staging table, data lines used; None = whole file)
+CSVS = [
+    ("biomarkers_kidney_clean.csv", "stg_biomarkers_kidney", None),
+    ("biomarkers_liver_clean.csv", "stg_biomarkers_liver", None),
+    ("nhs_cube09_dietary_clean.csv", "stg_nhs_cube09", 150),
+    ("obesity_anthropometrics_clean_v2.csv", "stg_obesity_anthro", 150),
+    ("chronic_indicators.csv", "stg_chronic_indicators", None),
+]
+CHUNK_ROWS = [1, 5, 20, 50, 100, 10_000]
+
+
+def _read_chunked(path, table, chunk_rows):
+    return pd.concat(list(loader.iter_staging_csv(path, table, chunk_rows)), ignore_index=True)
+
+
+@pytest.mark.parametrize("chunk_rows", CHUNK_ROWS)
+@pytest.mark.parametrize("name, table, lines", CSVS)
+def test_chunks_match_whole_file(tmp_path, name, table, lines, chunk_rows):
+    path = os.path.join(BACKEND, "data_clean", name)
+    if lines is not None:
+        with open(path, encoding="utf-8") as f:
+            head = [f.readline() for _ in range(lines + 1)]
+        path = tmp_path / name
+        path.write_text("".join(head), encoding="utf-8")
+    pd.testing.assert_frame_equal(_read_chunked(path, table, chunk_rows), loader.read_staging_csv(path, table))
+
+
+@pytest.mark.parametrize("chunk_rows", [3, 10])
+def test_biomarker_guess_is_decided_per_file(tmp_path, chunk_rows):
+    # value_pct is blank in the first rows only: the whole file keeps it, and
+    # so must every chunk, even one whose value_pct is entirely blank
+    raw = pd.read_csv(os.path.join(BACKEND, "data_clean", "biomarkers_kidney_clean.csv"), dtype=str)
+    raw.insert(0, "Value (%)", "1.0")
+    raw.loc[:9, "value_pct"] = None
+    path = tmp_path / "biomarkers_kidney.csv"
+    raw.to_csv(path, index=False)
+    whole = loader.read_staging_csv(path, "stg_biomarkers_kidney")
+    assert whole["value_pct"].head(10).isna().all()
+    pd.testing.assert_frame_equal(_read_chunked(path, "stg_biomarkers_kidney", chunk_rows), whole)
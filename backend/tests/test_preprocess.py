@@ -0,0 +1,61 @@
+"""
+Golden-output checks of the staging preprocessors (preprocess_biomarker_df,
+preprocess_nhs_cube_df) on the committed clean CSVs.
+
+The files in golden/ were written by the per-row implementations these
+functions replaced. Regenerate them only for an intended output change:
+_preprocess(<text read>, table).to_csv(<golden>, index=False).
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import loader
+from conftest import BACKEND
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+KIDNEY_CSV = os.path.join(BACKEND, "data_clean", "biomarkers_kidney_clean.csv")
+
+GOLDEN_CASES = [
+    ("biomarkers_kidney", "stg_biomarkers_kidney"),
+    ("biomarkers_liver", "stg_biomarkers_liver"),
+    ("nhs_cube09_dietary", "stg_nhs_cube09"),
+]
+
+
+def _read_text(path):
+    """Text read as read_staging_csv does it before preprocessing."""
+    return pd.read_csv(path, dtype=str, keep_default_na=True, na_values=loader.CSV_NA_VALUES)
+
+
+def _preprocess(df, table):
+    if table == "stg_nhs_cube09":
+        return loader.preprocess_nhs_cube_df(df)
+    return loader.preprocess_biomarker_df(table, df)
+
+
+@pytest.mark.parametrize("name, table", GOLDEN_CASES)
+def test_preprocess_matches_golden(name, table):
+    out = _preprocess(_read_text(os.path.join(BACKEND, "data_clean", f"{name}_clean.csv")), table)
+    with open(os.path.join(GOLDEN_DIR, f"{name}_preprocessed.csv"), encoding="utf-8", newline="") as f:
+        assert out.to_csv(index=False, lineterminator="\n") == f.read()
+
+
+@pytest.mark.parametrize("rows", [1, None])
+def test_biomarker_all_missing_labels(rows):
+    df = _read_text(KIDNEY_CSV).assign(note=None, category=None, indicator=None)
+    df = df.head(rows) if rows else df
+    out = loader.preprocess_biomarker_df("stg_biomarkers_kidney", df.copy())
+    assert len(out) == len(df)
+    assert out[["indicator", "category", "note"]].isna().all().all()
+    assert out["value_pct"].tolist() == df["value_pct"].tolist()
+
+
+def test_biomarker_single_row_without_note():
+    df = pd.DataFrame({"sex": ["Males"], "indicator": ["eGFR (mL/min/1.73m²) range – None – ≥90"],
+                       "category": [None], "value_pct": ["57.0"], "note": [None]})
+    out = loader.preprocess_biomarker_df("stg_biomarkers_kidney", df)
+    assert out.loc[0, "indicator"] == "eGFR (mL/min/1.73m²) range"
+    assert out.loc[0, "category"] == "≥90"
+    assert out.loc[0, "age_group"] == "All 18+"